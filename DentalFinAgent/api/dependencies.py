@@ -30,4 +30,16 @@ def require_doctor_role(user_id: str = Depends(get_current_user_id)):
             status_code=403,
             detail="Operation forbidden: Requires Doctor privileges."
         )
-    return user_id
\ No newline at end of file
+    return user_id
+
+def verify_clinical_webhook_key(
+    x_api_key: str = Header(..., alias="X-API-Key")
+) -> str:
+    """Validates the shared key the clinical system uses when posting completion events."""
+    if x_api_key != settings.CLINICAL_WEBHOOK_KEY:
+        logger.warning("Invalid clinical webhook key attempted.")
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid API Key or credentials provided."
+        )
+    return "clinical_system"
\ No newline at end of file
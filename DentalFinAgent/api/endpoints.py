@@ -1,15 +1,19 @@
 # api/endpoints.py
 
-from fastapi import APIRouter, Depends, status, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, Request, status, HTTPException
+from typing import List, Union
 import logging
 
 # Import core logic and data models
 from core.financial_reports import FinancialReports
 from core.status_tracker import StatusTracker
+from core.agentic_pipeline import AgenticPipeline
+from core.event_batcher import ProcedureEventBatcher
 from models.report_schema import MonthlyRevenueReport, AgedARReport
 from models.billing_schema import InvoiceUpdate
-from api.dependencies import require_doctor_role, get_current_user_id
+from models.clinical_schema import ProcedureCompletedEvent, EventIngestAck
+from database.db_session import check_database
+from api.dependencies import require_doctor_role, get_current_user_id, verify_clinical_webhook_key
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -17,6 +21,7 @@ logger = logging.getLogger(__name__)
 # Instantiate core services
 reports_service = FinancialReports()
 status_service = StatusTracker()
+event_batcher = ProcedureEventBatcher(AgenticPipeline())
 
 
 # --- Health Check ---
@@ -25,6 +30,15 @@ def health_check():
     """Confirms the API is running."""
     return {"status": "ok", "agent": "DentalFinAgent"}
 
+@router.get("/ready", status_code=status.HTTP_200_OK, tags=["System"])
+def readiness_check(request: Request):
+    """Confirms background startup warm-up has finished and the database is reachable."""
+    if not getattr(request.app.state, "ready", False):
+        raise HTTPException(status_code=503, detail="Warming up.")
+    if not check_database():
+        raise HTTPException(status_code=503, detail="Database unavailable.")
+    return {"status": "ready", "agent": "DentalFinAgent"}
+
 
 # --- Financial Reporting Endpoints (Doctor Access) ---
 @router.get(
@@ -68,4 +82,44 @@ def update_invoice_payment_status(
     if not success:
         raise HTTPException(status_code=404, detail="Invoice not found.")
 
-    return {"message": f"Invoice {invoice_id} status updated successfully."}
\ No newline at end of file
+    return {"message": f"Invoice {invoice_id} status updated successfully."}
+
+
+# --- Clinical Event Ingest (Clinical System Webhook) ---
+@router.post(
+    "/events/procedure-completed",
+    response_model=EventIngestAck,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["Events"],
+    dependencies=[Depends(verify_clinical_webhook_key)]
+)
+async def ingest_procedure_completed(events: Union[List[ProcedureCompletedEvent], ProcedureCompletedEvent]):
+    """
+    Receives "procedure completed" events (single or batched) from the clinical system.
+    Events are only queued here; the Agentic Pipeline runs them in micro-batches.
+    Duplicate case IDs are dropped per worker process only: after a restart, or on
+    another worker, a redelivered event is processed (and invoiced) again.
+    """
+    # async: submit() never blocks on the pipeline, so acking skips the threadpool hop
+    if isinstance(events, ProcedureCompletedEvent):
+        events = [events]
+    if len(events) > event_batcher.max_queue_size:
+        # Could never fit in the queue, so a 429 retry would loop forever
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many events in one request (max {event_batcher.max_queue_size})."
+        )
+
+    ack = event_batcher.submit([event.case_id for event in events])
+    if ack is None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Event queue is full. Retry later.",
+            headers={"Retry-After": "1"}
+        )
+    return ack
+
+@router.get("/events/stats", tags=["Events"])
+def get_event_ingest_stats(user_id: str = Depends(get_current_user_id)):
+    """Ingest counters (accepted, duplicates, rejected, processed, failed, unreconciled) and queue depth."""
+    return event_batcher.stats()
\ No newline at end of file
@@ -0,0 +1,142 @@
+# benchmarks/ingest_load.py
+#
+# Local load generator for the procedure-completed ingest endpoint.
+# It also serves a stub clinical + billing system (default port 8900) so the
+# pipeline does real work. Start the API pointed at the stub first, e.g.:
+#   CLINICAL_SYSTEM_URL=http://127.0.0.1:8900 BILLING_SOFTWARE_URL=http://127.0.0.1:8900 uvicorn server:app
+# then run:
+#   python benchmarks/ingest_load.py --events 20000 --batch-size 10 --concurrency 16
+
+import argparse
+import json
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+
+STUB_CALLS = {"procedures": 0, "invoices": 0}
+_stub_lock = threading.Lock()
+
+class StubIntegrationHandler(BaseHTTPRequestHandler):
+    """Answers the clinical system (GET /procedures/<id>) and billing software (POST /invoices)."""
+
+    def _reply(self, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        with _stub_lock:
+            STUB_CALLS["procedures"] += 1
+        self._reply({
+            "patient_id": "bench-patient",
+            "procedure_code": "D1110",
+            "procedure_description": "Prophylaxis",
+            "provider_id": "bench-provider",
+            "internal_cost": 40.0,
+        })
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with _stub_lock:
+            STUB_CALLS["invoices"] += 1
+        self._reply({"reference_id": f"BENCH-{uuid.uuid4().hex}"})
+
+    def log_message(self, format, *args):
+        pass
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure ack latency and sustained events/sec for event ingest.")
+    parser.add_argument("--url", default="http://localhost:8000/api")
+    parser.add_argument("--webhook-key", default="SECURE_CLINICAL_WEBHOOK_KEY")
+    parser.add_argument("--staff-key", default="SECURE_DENTAL_KEY_STAFF")
+    parser.add_argument("--events", type=int, default=10000, help="Total events to send.")
+    parser.add_argument("--batch-size", type=int, default=1, help="Events per request (1 sends single-event payloads).")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0, help="Fraction of events re-sent with a seen case ID.")
+    parser.add_argument("--stub-port", type=int, default=8900, help="Port for the stub clinical/billing system (0 disables it).")
+    parser.add_argument("--drain-timeout", type=float, default=120.0, help="Seconds to wait for the queue to drain.")
+    args = parser.parse_args()
+
+    if args.stub_port:
+        stub = ThreadingHTTPServer(("127.0.0.1", args.stub_port), StubIntegrationHandler)
+        threading.Thread(target=stub.serve_forever, daemon=True).start()
+
+    headers = {"X-API-Key": args.webhook_key}
+    run_id = uuid.uuid4().hex[:8]
+    case_ids = [f"{run_id}-{i}" for i in range(args.events)]
+    duplicates = int(args.events * args.duplicate_ratio)
+    case_ids[len(case_ids) - duplicates:] = case_ids[:duplicates]
+    payloads = [case_ids[i:i + args.batch_size] for i in range(0, len(case_ids), args.batch_size)]
+
+    session = requests.Session()
+    stats_before = session.get(f"{args.url}/events/stats", headers={"X-API-Key": args.staff_key}).json()
+
+    local = threading.local()
+
+    def send(ids):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        payload = {"case_id": ids[0]} if args.batch_size == 1 else [{"case_id": case_id} for case_id in ids]
+        start = time.perf_counter()
+        response = local.session.post(f"{args.url}/events/procedure-completed", json=payload, headers=headers, timeout=10)
+        return time.perf_counter() - start, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(send, payloads))
+    send_elapsed = time.perf_counter() - started
+
+    latencies_ms = [elapsed * 1000 for elapsed, code in results if code == 202]
+    rejected = sum(1 for _, code in results if code == 429)
+    errors = sum(1 for _, code in results if code not in (202, 429))
+
+    # Wait for the micro-batcher to drain what was accepted (bounded, in case the
+    # server restarts or other traffic moves the counters)
+    drain_deadline = time.monotonic() + args.drain_timeout
+    drained_fully = False
+    stats = stats_before
+    while time.monotonic() < drain_deadline:
+        stats = session.get(f"{args.url}/events/stats", headers={"X-API-Key": args.staff_key}).json()
+        finished = stats["processed"] + stats["failed"] + stats["unreconciled"]
+        if stats["queued"] == 0 and finished >= (
+            stats_before["processed"] + stats_before["failed"] + stats_before["unreconciled"]
+            + stats["accepted"] - stats_before["accepted"]
+        ):
+            drained_fully = True
+            break
+        time.sleep(0.05)
+    total_elapsed = time.perf_counter() - started
+    processed = stats["processed"] - stats_before["processed"]
+    failed = stats["failed"] - stats_before["failed"]
+    unreconciled = stats["unreconciled"] - stats_before["unreconciled"]
+
+    print(f"requests sent:        {len(results)} ({args.events} events, batch size {args.batch_size})")
+    print(f"accepted / rejected:  {len(latencies_ms)} / {rejected} requests ({errors} errors)")
+    print(f"deduplicated events:  {stats['duplicates'] - stats_before['duplicates']}")
+    if latencies_ms:
+        print(f"ack latency ms:       p50={statistics.median(latencies_ms):.2f} "
+              f"p95={percentile(latencies_ms, 95):.2f} p99={percentile(latencies_ms, 99):.2f} max={max(latencies_ms):.2f}")
+    print(f"ingest (ack) rate:    {args.events / send_elapsed:.0f} events/s")
+    print(f"sustained rate:       {processed / total_elapsed:.0f} events/s invoiced, {failed} failed, {unreconciled} unreconciled "
+          f"({stats['batches'] - stats_before['batches']} batches)")
+    if not drained_fully:
+        print(f"WARNING: queue did not drain within {args.drain_timeout}s; sustained rate is a lower bound.")
+    if args.stub_port:
+        print(f"stub calls:           {STUB_CALLS['procedures']} procedure fetches, {STUB_CALLS['invoices']} invoice pushes")
+        if drained_fully and not STUB_CALLS["procedures"]:
+            print("WARNING: the API never called the stub; check CLINICAL_SYSTEM_URL/BILLING_SOFTWARE_URL. "
+                  "Only the ack numbers are meaningful.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/startup.py
+#
+# Cold-start benchmark: each run is a fresh interpreter with an empty SQLite database.
+# Measures import time of server.py, lifespan startup time, time until /api/ready
+# returns 200 (background warm-up done), and the latency of the first and second
+# requests to a report endpoint.
+#   python benchmarks/startup.py --runs 5
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, time
+t0 = time.perf_counter()
+import server
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(server.app)
+t2 = time.perf_counter()
+client.__enter__()  # runs the lifespan startup
+t3 = time.perf_counter()
+ready = client.get("/api/ready").status_code
+while client.get("/api/ready").status_code != 200:
+    time.sleep(0.001)
+t4 = time.perf_counter()
+headers = {"X-API-Key": server.settings.DOCTOR_API_KEY}
+timings = []
+for _ in range(2):
+    start = time.perf_counter()
+    response = client.get(ENDPOINT, headers=headers)
+    timings.append(time.perf_counter() - start)
+    assert response.status_code == 200, response.text
+client.__exit__(None, None, None)
+print("RESULT " + json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "startup_ms": (t3 - t2) * 1000,
+    "ready_ms": (t4 - t2) * 1000,
+    "first_request_ms": timings[0] * 1000,
+    "second_request_ms": timings[1] * 1000,
+    "first_ready_status": ready,
+}))
+"""
+
+def run_once(endpoint: str) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        output = subprocess.run(
+            [sys.executable, "-c", f"ENDPOINT = {endpoint!r}\n{CHILD}"],
+            cwd=APP_DIR, env=env, capture_output=True, text=True, check=True
+        ).stdout
+    result_line = [line for line in output.splitlines() if line.startswith("RESULT ")][-1]
+    return json.loads(result_line[len("RESULT "):])
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time and first-request latency for a cold worker.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--endpoint", default="/api/reports/monthly-revenue")
+    args = parser.parse_args()
+
+    results = [run_once(args.endpoint) for _ in range(args.runs)]
+    for key in ("import_ms", "startup_ms", "ready_ms", "first_request_ms", "second_request_ms"):
+        values = [r[key] for r in results]
+        print(f"{key:<18} median={statistics.median(values):8.1f}  min={min(values):8.1f}  max={max(values):8.1f}")
+    print(f"/api/ready right after startup: {sorted(set(r['first_ready_status'] for r in results))}")
+
+if __name__ == "__main__":
+    main()
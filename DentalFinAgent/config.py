@@ -14,11 +14,23 @@ class Settings(BaseSettings):
     
     # --- Database Settings (Internal Invoice Tracking) ---
     # NOTE: The format MUST be correct for SQLAlchemy to parse it. 
-    DATABASE_URL: str = "sqlite:///./dentalfin_data.db" # Confirmed correct SQLite URL
+    DATABASE_URL: str = "sqlite:///./dentalfin_data.db" # Confirmed correct SQLite URL (primary, receives all writes)
+
+    # Optional reporting database (read replica or SQLite snapshot copy) for report queries.
+    # Leave empty to run reports against the primary DATABASE_URL.
+    READ_DATABASE_URL: str = ""
+    # Bounded staleness for the reporting database, in seconds.
+    # SQLite snapshot: required (> 0); a background thread refreshes it from the primary
+    # and reports fall back to the primary if it is ever older than this.
+    # Postgres replica: optional (0 = no lag check); a lagging replica falls back to the primary.
+    READ_MAX_STALENESS_SECONDS: float = 0.0
+    # Connections opened per engine at startup so the first request does not pay for them
+    DB_POOL_WARMUP_CONNECTIONS: int = 2
     
     # --- External System Keys (Used by dependencies.py) ---
     DOCTOR_API_KEY: str = "SECURE_DENTAL_KEY_DOCTOR"  # Placeholder key for Doctor access
     STAFF_API_KEY: str = "SECURE_DENTAL_KEY_STAFF"    # Placeholder key for Staff access
+    CLINICAL_WEBHOOK_KEY: str = "SECURE_CLINICAL_WEBHOOK_KEY"  # Placeholder key for clinical system events
 
     # --- Agentic AI / External Integration Keys ---
     GOOGLE_API_KEY: str = "" # Read from .env
@@ -28,5 +40,11 @@ class Settings(BaseSettings):
     BILLING_SOFTWARE_URL: str = "http://billing.api/v1"
     CKB_DATABASE_URL: str = "http://ckb.api/v1"
 
+    # --- Procedure Event Ingest (Micro-Batching) ---
+    EVENT_BATCH_MAX_SIZE: int = 50              # Flush a batch once this many events are queued
+    EVENT_BATCH_MAX_WAIT_SECONDS: float = 0.5   # ...or once the oldest queued event has waited this long
+    EVENT_QUEUE_MAX_SIZE: int = 5000            # Backpressure: reject new events beyond this many queued
+    EVENT_DEDUP_WINDOW: int = 20000             # Recent case IDs remembered for deduplication (raised to cover the queue)
+
 # Initialize settings object
 settings = Settings()
\ No newline at end of file
@@ -1,59 +1,146 @@
 # core/agentic_pipeline.py
 
 import logging
-from typing import Optional
+from enum import Enum
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional
+from sqlalchemy.exc import SQLAlchemyError
 from models.clinical_schema import ClinicalProcedureData
 from models.billing_schema import InvoiceRecord
-from integrations.clinical_system_adapter import ClinicalSystemAdapter
-from integrations.billing_software_api import BillingSoftwareAPI
 from core.billing_engine import BillingEngine
-from database.crud import create_invoice_record
+from database.crud import create_invoice_record, create_invoice_records
 from database.db_session import get_session
 
+if TYPE_CHECKING:
+    from integrations.clinical_system_adapter import ClinicalSystemAdapter
+    from integrations.billing_software_api import BillingSoftwareAPI
+
 logger = logging.getLogger(__name__)
 # Initialize core components
-clinical_adapter = ClinicalSystemAdapter()
-billing_api = BillingSoftwareAPI()
 billing_engine = BillingEngine()
 
+# Integration clients (and the 'requests' import behind them) are built on first use,
+# so importing the API stays cheap for cold workers.
+@lru_cache(maxsize=None)
+def get_clinical_adapter() -> "ClinicalSystemAdapter":
+    from integrations.clinical_system_adapter import ClinicalSystemAdapter
+    return ClinicalSystemAdapter()
+
+@lru_cache(maxsize=None)
+def get_billing_api() -> "BillingSoftwareAPI":
+    from integrations.billing_software_api import BillingSoftwareAPI
+    return BillingSoftwareAPI()
+
+
+class ProcedureOutcome(str, Enum):
+    """Result of running one case through the batch pipeline."""
+    INVOICED = "Invoiced"                      # Saved internally (with an external ref or an ERR- marker)
+    RETRYABLE = "Retryable"                    # Failed before any external invoice was created
+    NEEDS_RECONCILIATION = "Needs_Reconciliation"  # External invoice created, internal save failed
+
 
 class AgenticPipeline:
     """
-    The main Agentic AI orchestration layer. 
+    The main Agentic AI orchestration layer.
     It manages the lifecycle from completed procedure to final invoice creation.
     """
-    def process_completed_procedure(self, case_id: str) -> Optional[InvoiceRecord]:
+    def _build_invoice(self, case_id: str) -> Optional[InvoiceRecord]:
         """
-        1. Grabs data. 2. Calculates profit. 3. Creates external and internal invoice.
+        1. Grabs data. 2. Calculates profit. 3. Creates the external invoice.
+        Returns the invoice ready to be saved internally, or None on failure.
         """
         logger.info(f"Agentic Pipeline triggered for case ID: {case_id}")
-        
+
         # 1. Grab necessary Procedure and Cost data (Agentic Data Handling)
-        clinical_data: Optional[ClinicalProcedureData] = clinical_adapter.fetch_procedure_data(case_id)
+        clinical_data: Optional[ClinicalProcedureData] = get_clinical_adapter().fetch_procedure_data(case_id)
         if not clinical_data:
             logger.error(f"Failed to fetch or validate clinical data for case {case_id}.")
             return None
-        
+
         # 2. Calculate final charge and actual profit (Agentic Intelligence)
         invoice_data: Optional[InvoiceRecord] = billing_engine.calculate_and_generate_invoice(clinical_data)
         if not invoice_data:
             logger.error(f"Billing Engine failed to generate invoice for case {case_id}.")
             return None
-        
+
         # 3. Push to external billing software (Agentic Automation)
-        external_ref_id = billing_api.create_external_invoice(invoice_data)
+        try:
+            external_ref_id = get_billing_api().create_external_invoice(invoice_data)
+        except Exception as e:
+            # e.g. a non-JSON reply; the ERR- record below keeps it visible for follow-up
+            logger.error(f"Unexpected error pushing invoice for case {case_id}: {e}")
+            external_ref_id = None
         if not external_ref_id:
             logger.error(f"Failed to send invoice to external billing software for case {case_id}.")
             # Even if external push fails, we still track it internally
-        
+
         # Update the invoice record with the external ID
         invoice_data.invoice_id = external_ref_id if external_ref_id else f"ERR-{case_id}"
+        return invoice_data
+
+    def process_completed_procedure(self, case_id: str) -> Optional[InvoiceRecord]:
+        """
+        Runs the full pipeline for one case and saves the invoice to the internal database.
+        """
+        invoice_data = self._build_invoice(case_id)
+        if not invoice_data:
+            return None
 
         # 4. Save to internal tracking database
         session_generator = get_session()
         session = next(session_generator) # Get the session object
-        
+
         internal_invoice = create_invoice_record(session, invoice_data)
-        
+
         logger.info(f"Procedure {case_id} successfully processed. Internal ID: {internal_invoice.invoice_id}")
-        return internal_invoice
\ No newline at end of file
+        return internal_invoice
+
+    def process_completed_procedures(self, case_ids: List[str]) -> Dict[str, ProcedureOutcome]:
+        """
+        Batch variant used by the event ingest path: builds every invoice, then saves
+        them in a single transaction. Returns a ProcedureOutcome per case ID.
+        """
+        outcomes: Dict[str, ProcedureOutcome] = {}
+        invoices: Dict[str, InvoiceRecord] = {}
+        for case_id in case_ids:
+            # One failing case must not discard invoices already pushed for the others
+            try:
+                invoice = self._build_invoice(case_id)
+            except Exception as e:
+                logger.error(f"Agentic Pipeline failed for case {case_id}: {e}")
+                invoice = None
+            if invoice:
+                invoices[case_id] = invoice
+            else:
+                outcomes[case_id] = ProcedureOutcome.RETRYABLE
+        if not invoices:
+            return outcomes
+
+        session = next(get_session())
+        try:
+            create_invoice_records(session, list(invoices.values()))
+            outcomes.update({case_id: ProcedureOutcome.INVOICED for case_id in invoices})
+        except SQLAlchemyError as e:
+            # One bad row (e.g. a repeated ERR- ID) must not drop the whole batch
+            logger.error(f"Batch insert of {len(invoices)} invoices failed, retrying individually: {e}")
+            session.rollback()
+            for case_id, invoice in invoices.items():
+                try:
+                    create_invoice_record(session, invoice)
+                    outcomes[case_id] = ProcedureOutcome.INVOICED
+                except SQLAlchemyError as e:
+                    session.rollback()
+                    if invoice.invoice_id.startswith("ERR-"):
+                        logger.error(f"Failed to save invoice for case {case_id}: {e}")
+                        outcomes[case_id] = ProcedureOutcome.RETRYABLE
+                    else:
+                        # Retrying would bill the patient a second time externally
+                        logger.error(
+                            f"RECONCILE: external invoice {invoice.invoice_id} for case {case_id} "
+                            f"was created but could not be saved internally: {e}"
+                        )
+                        outcomes[case_id] = ProcedureOutcome.NEEDS_RECONCILIATION
+
+        invoiced = sum(1 for outcome in outcomes.values() if outcome == ProcedureOutcome.INVOICED)
+        logger.info(f"Processed batch of {len(case_ids)} procedures, {invoiced} invoiced.")
+        return outcomes
\ No newline at end of file
@@ -0,0 +1,150 @@
+# core/event_batcher.py
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional
+from config import settings
+from core.agentic_pipeline import AgenticPipeline, ProcedureOutcome
+
+logger = logging.getLogger(__name__)
+
+class ProcedureEventBatcher:
+    """
+    Buffers "procedure completed" events and feeds them into the Agentic Pipeline
+    in micro-batches, flushing on batch size or on the oldest event's wait time.
+    Events are deduplicated by case ID and rejected when the queue is full.
+    Deduplication lives in process memory only: a restarted or second worker will
+    process a redelivered case again.
+    """
+    def __init__(self, pipeline: AgenticPipeline):
+        self.pipeline = pipeline
+        self.max_batch_size = settings.EVENT_BATCH_MAX_SIZE
+        self.max_wait_seconds = settings.EVENT_BATCH_MAX_WAIT_SECONDS
+        self.max_queue_size = settings.EVENT_QUEUE_MAX_SIZE
+        # Queued and in-flight IDs must never be evicted, or they would be accepted twice
+        self.dedup_window = max(settings.EVENT_DEDUP_WINDOW, self.max_queue_size + self.max_batch_size)
+
+        self._pending = deque()        # (case_id, arrival time) waiting to be flushed
+        self._seen = OrderedDict()     # case IDs queued, in flight or recently processed
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._worker: Optional[threading.Thread] = None
+        self._stopping = False
+        self._stats = {"accepted": 0, "duplicates": 0, "rejected": 0, "processed": 0, "failed": 0,
+                       "unreconciled": 0, "batches": 0}
+
+    def submit(self, case_ids: List[str]) -> Optional[Dict[str, int]]:
+        """
+        Queues new case IDs for processing without waiting for the pipeline.
+        Returns accepted/duplicate counts, or None if the queue is full (backpressure).
+        Callers must keep requests within max_queue_size events, or they can never fit.
+        """
+        now = time.monotonic()
+        with self._cond:
+            new_ids = []
+            batch_ids = set()
+            for case_id in case_ids:
+                if case_id in self._seen or case_id in batch_ids:
+                    continue
+                batch_ids.add(case_id)
+                new_ids.append(case_id)
+            duplicates = len(case_ids) - len(new_ids)
+
+            # All-or-nothing so the sender can safely retry the whole request
+            if len(self._pending) + len(new_ids) > self.max_queue_size:
+                self._stats["rejected"] += len(new_ids)
+                return None
+
+            for case_id in new_ids:
+                self._remember(case_id)
+                self._pending.append((case_id, now))
+            self._stats["accepted"] += len(new_ids)
+            self._stats["duplicates"] += duplicates
+
+            if new_ids:
+                self._ensure_worker()
+                self._cond.notify()
+
+        return {"accepted": len(new_ids), "duplicates": duplicates}
+
+    def stats(self) -> Dict[str, int]:
+        """Returns ingest counters and the current queue depth."""
+        with self._cond:
+            return {**self._stats, "queued": len(self._pending)}
+
+    def stop(self, timeout: float = 10.0):
+        """Flushes queued events and stops the worker thread."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._worker:
+            self._worker.join(timeout)
+            if self._worker.is_alive():
+                with self._cond:
+                    queued, in_flight = len(self._pending), self._in_flight
+                logger.error(
+                    f"Event batcher did not drain within {timeout}s: {queued} queued and {in_flight} in-flight "
+                    "acknowledged events were not processed."
+                )
+
+    def _remember(self, case_id: str):
+        self._seen[case_id] = None
+        while len(self._seen) > self.dedup_window:
+            self._seen.popitem(last=False)
+
+    def _ensure_worker(self):
+        # Started on first use so importing the API does not spawn threads
+        if self._worker is None or not self._worker.is_alive():
+            self._stopping = False
+            self._worker = threading.Thread(target=self._run, name="procedure-event-batcher", daemon=True)
+            self._worker.start()
+
+    def _next_batch(self) -> Optional[List[str]]:
+        """Blocks until a batch is due; returns None once stopped and drained."""
+        with self._cond:
+            while not self._pending:
+                if self._stopping:
+                    return None
+                self._cond.wait()
+
+            deadline = self._pending[0][1] + self.max_wait_seconds
+            while len(self._pending) < self.max_batch_size and not self._stopping:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            size = min(self.max_batch_size, len(self._pending))
+            self._in_flight = size
+            return [self._pending.popleft()[0] for _ in range(size)]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._flush(batch)
+
+    def _flush(self, batch: List[str]):
+        try:
+            outcomes = self.pipeline.process_completed_procedures(batch)
+        except Exception as e:
+            # Some invoices may already be external, so none of these are safe to retry
+            logger.error(f"RECONCILE: Agentic Pipeline failed for batch {batch}: {e}")
+            outcomes = {case_id: ProcedureOutcome.NEEDS_RECONCILIATION for case_id in batch}
+
+        counts = {outcome: 0 for outcome in ProcedureOutcome}
+        with self._cond:
+            for case_id in batch:
+                outcome = outcomes.get(case_id, ProcedureOutcome.NEEDS_RECONCILIATION)
+                counts[outcome] += 1
+                # Only cases that never reached the billing system may be redelivered
+                if outcome == ProcedureOutcome.RETRYABLE:
+                    self._seen.pop(case_id, None)
+            self._in_flight = 0
+            self._stats["batches"] += 1
+            self._stats["processed"] += counts[ProcedureOutcome.INVOICED]
+            self._stats["failed"] += counts[ProcedureOutcome.RETRYABLE]
+            self._stats["unreconciled"] += counts[ProcedureOutcome.NEEDS_RECONCILIATION]
\ No newline at end of file
@@ -4,7 +4,7 @@ import logging
 from typing import List
 from datetime import datetime, timedelta
 from database.crud import get_all_invoices
-from database.db_session import get_session
+from database.db_session import get_read_session
 from models.report_schema import MonthlyRevenueReport, AgedARReport, AgedARDetail
 from models.billing_schema import InvoiceRecord, PaymentStatus
 
@@ -15,12 +15,13 @@ class FinancialReports:
     Generates immediate, easy access to essential financial reports for doctors.
     """
     def __init__(self):
-        # Dependencies are instantiated outside the loop (using get_session for DB access)
+        # Dependencies are instantiated outside the loop (using get_read_session so reports
+        # run against the reporting database and do not contend with writers)
         pass
 
     def get_monthly_revenue(self) -> MonthlyRevenueReport:
         """Calculates Total Monthly Revenue and Net Profit (based on gross billings)."""
-        session = next(get_session())
+        session = next(get_read_session())
         all_invoices: List[InvoiceRecord] = get_all_invoices(session)
 
         # Filter for the current month (simplified)
@@ -43,7 +44,7 @@ class FinancialReports:
 
     def get_aged_ar(self) -> List[AgedARReport]:
         """Calculates a clear picture of all Outstanding Patient Balances (Aged A/R)."""
-        session = next(get_session())
+        session = next(get_read_session())
         all_invoices: List[InvoiceRecord] = get_all_invoices(session)
         now = datetime.utcnow()
         
@@ -10,14 +10,22 @@ def get_invoice_by_id(session: Session, invoice_id: str) -> Optional[InvoiceReco
     return session.exec(statement).first()
 
 def create_invoice_record(session: Session, invoice: InvoiceRecord) -> InvoiceRecord:
-    """Creates a new invoice record in the internal database."""
+    """Creates a new invoice record in the internal database (session must be on the primary)."""
     session.add(invoice)
     session.commit()
     session.refresh(invoice)
     return invoice
 
+def create_invoice_records(session: Session, invoices: List[InvoiceRecord]) -> List[InvoiceRecord]:
+    """Creates several invoice records in a single transaction (session must be on the primary)."""
+    session.add_all(invoices)
+    session.commit()
+    for invoice in invoices:
+        session.refresh(invoice)
+    return invoices
+
 def update_invoice_status(session: Session, invoice_id: str, update_data: InvoiceUpdate) -> Optional[InvoiceRecord]:
-    """Updates the payment status and date of an existing invoice."""
+    """Updates the payment status and date of an existing invoice (session must be on the primary)."""
     db_invoice = get_invoice_by_id(session, invoice_id)
     if db_invoice is None:
         return None
@@ -1,16 +1,186 @@
 # database/db_session.py
 
+import logging
+import threading
+import time
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import create_engine, SQLModel, Session
 from config import settings
 
-# The engine connects to the database specified in config.py
+logger = logging.getLogger(__name__)
+
+# The engine connects to the database specified in config.py (primary, used for all writes)
 engine = create_engine(settings.DATABASE_URL, echo=True)
 
+# Reports read from a separate replica/snapshot when configured, otherwise from the primary
+read_engine = create_engine(settings.READ_DATABASE_URL, echo=True) if settings.READ_DATABASE_URL else engine
+
+_snapshot_lock = threading.Lock()
+_snapshot_refreshed_at: Optional[float] = None
+_refresher: Optional[threading.Thread] = None
+_refresher_lock = threading.Lock()
+
+# The replica lag probe is cached briefly so it does not add a round trip to every report
+_LAG_CHECK_INTERVAL_SECONDS = 1.0
+_replica_choice = None
+_replica_checked_at: Optional[float] = None
+
+def _is_sqlite(db_engine) -> bool:
+    return db_engine.dialect.name == "sqlite"
+
+def _uses_snapshot() -> bool:
+    """True when reports read from a SQLite snapshot copy of the primary."""
+    return read_engine is not engine and _is_sqlite(read_engine)
+
+def _validate_read_routing():
+    """Rejects reporting setups that could never be kept within the staleness bound."""
+    if read_engine is engine:
+        return
+    max_staleness = settings.READ_MAX_STALENESS_SECONDS
+    if _is_sqlite(read_engine):
+        if not _is_sqlite(engine):
+            raise ValueError("A SQLite READ_DATABASE_URL is a snapshot copy and requires a SQLite DATABASE_URL.")
+        if max_staleness <= 0:
+            raise ValueError("READ_MAX_STALENESS_SECONDS must be > 0 when READ_DATABASE_URL is a SQLite snapshot.")
+    elif read_engine.dialect.name != "postgresql" and max_staleness > 0:
+        logger.warning(
+            f"READ_MAX_STALENESS_SECONDS is not enforced for '{read_engine.dialect.name}' read databases; "
+            "reports will read from the replica regardless of lag."
+        )
+
+_validate_read_routing()
+
 def create_db_and_tables():
     """Initializes the database and creates all tables defined by SQLModel."""
     SQLModel.metadata.create_all(engine)
 
+def refresh_read_snapshot():
+    """Copies the primary SQLite database into the reporting snapshot file."""
+    global _snapshot_refreshed_at
+    with _snapshot_lock:
+        source = engine.raw_connection()
+        target = read_engine.raw_connection()
+        try:
+            source.driver_connection.backup(target.driver_connection)
+        finally:
+            target.close()
+            source.close()
+        _snapshot_refreshed_at = time.monotonic()
+    logger.info("Reporting snapshot refreshed from the primary database.")
+
+def _refresh_snapshot_forever():
+    # Refresh at half the bound so the snapshot stays within it, backup time included
+    interval = settings.READ_MAX_STALENESS_SECONDS / 2
+    while True:
+        refreshed_at = _snapshot_refreshed_at
+        if refreshed_at is None or time.monotonic() - refreshed_at >= interval:
+            try:
+                refresh_read_snapshot()
+            except Exception as e:
+                logger.error(f"Reporting snapshot refresh failed: {e}")
+        time.sleep(interval)
+
+def start_read_snapshot_refresher(initial_refresh: bool = False):
+    """
+    Starts the background thread that keeps the SQLite snapshot fresh, so the copy
+    never runs on a report request. With initial_refresh, copies once before returning.
+    """
+    global _refresher
+    if not _uses_snapshot():
+        return
+    if initial_refresh and _snapshot_refreshed_at is None:
+        refresh_read_snapshot()
+    if _refresher is not None and _refresher.is_alive():
+        return
+    with _refresher_lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = threading.Thread(target=_refresh_snapshot_forever, name="read-snapshot-refresher", daemon=True)
+            _refresher.start()
+
+def _replica_lag_seconds() -> Optional[float]:
+    """Returns the replay lag of a Postgres read replica, or None if it cannot be determined."""
+    # A replica that has replayed everything it received is current, however long
+    # ago the last write was; only measure time when WAL is still waiting to replay.
+    with read_engine.connect() as conn:
+        lag = conn.execute(
+            text(
+                "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+            )
+        ).scalar()
+    return float(lag) if lag is not None else None
+
+def _select_replica_engine(max_staleness: float):
+    """Routes to the Postgres replica unless it is lagging or unreachable (cached briefly)."""
+    global _replica_choice, _replica_checked_at
+    now = time.monotonic()
+    if _replica_checked_at is not None and now - _replica_checked_at < _LAG_CHECK_INTERVAL_SECONDS:
+        return _replica_choice
+
+    try:
+        lag = _replica_lag_seconds()
+    except SQLAlchemyError as e:
+        logger.warning(f"Read replica unreachable; reading from primary: {e}")
+        choice = engine
+    else:
+        if lag is not None and lag > max_staleness:
+            logger.warning(f"Read replica is {lag:.1f}s behind (bound {max_staleness}s); reading from primary.")
+            choice = engine
+        else:
+            choice = read_engine
+
+    _replica_choice, _replica_checked_at = choice, now
+    return choice
+
+def _select_read_engine():
+    """Picks the engine for report reads, honouring READ_MAX_STALENESS_SECONDS."""
+    if read_engine is engine:
+        return engine
+    max_staleness = settings.READ_MAX_STALENESS_SECONDS
+
+    if _uses_snapshot():
+        start_read_snapshot_refresher()
+        refreshed_at = _snapshot_refreshed_at
+        if refreshed_at is None or time.monotonic() - refreshed_at > max_staleness:
+            logger.warning("Reporting snapshot is missing or stale; reading from primary.")
+            return engine
+        return read_engine
+
+    if read_engine.dialect.name == "postgresql" and max_staleness > 0:
+        return _select_replica_engine(max_staleness)
+
+    return read_engine
+
+def warm_up_pool(connections: int):
+    """Opens pooled connections on the primary and reporting engines ahead of the first request."""
+    engines = [engine] if read_engine is engine else [engine, read_engine]
+    for db_engine in engines:
+        opened = [db_engine.connect() for _ in range(max(connections, 1))]
+        try:
+            for conn in opened:
+                conn.execute(text("SELECT 1"))
+        finally:
+            for conn in opened:
+                conn.close()
+
+def check_database() -> bool:
+    """Readiness probe: returns True if the primary database answers a trivial query."""
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return True
+    except Exception as e:
+        logger.error(f"Database readiness check failed: {e}")
+        return False
+
 def get_session():
-    """Dependency to provide a database session."""
+    """Dependency to provide a database session on the primary (use for all writes)."""
     with Session(engine) as session:
+        yield session
+
+def get_read_session():
+    """Dependency to provide a read-only reporting session (replica/snapshot if configured)."""
+    with Session(_select_read_engine()) as session:
         yield session
\ No newline at end of file
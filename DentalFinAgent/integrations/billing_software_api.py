@@ -2,7 +2,7 @@
 
 import requests
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from config import settings
 from models.billing_schema import InvoiceRecord
 
@@ -1,6 +1,7 @@
 # models/clinical_schema.py
 
 from pydantic import BaseModel, Field
+from typing import Optional
 from datetime import datetime
 
 class ClinicalProcedureData(BaseModel):
@@ -10,4 +11,14 @@ class ClinicalProcedureData(BaseModel):
     procedure_description: str = Field(..., description="Human-readable description of the service.")
     provider_id: str = Field(..., description="ID of the treating dentist/provider.")
     completion_date: datetime = Field(default_factory=datetime.utcnow, description="Timestamp of when the procedure was completed.")
-    internal_cost: float = Field(..., description="The calculated actual internal cost (materials, labor, overhead) of the procedure.")
\ No newline at end of file
+    internal_cost: float = Field(..., description="The calculated actual internal cost (materials, labor, overhead) of the procedure.")
+
+class ProcedureCompletedEvent(BaseModel):
+    """Webhook payload sent by the clinical system when a procedure is completed."""
+    case_id: str = Field(..., description="Clinical case identifier used to fetch procedure and cost data.")
+    completed_at: Optional[datetime] = Field(default=None, description="Completion timestamp reported by the clinical system.")
+
+class EventIngestAck(BaseModel):
+    """Acknowledgement returned once completion events are queued for processing."""
+    accepted: int = Field(..., description="Number of new events queued for the Agentic Pipeline.")
+    duplicates: int = Field(..., description="Number of events skipped because their case ID was already seen.")
\ No newline at end of file
@@ -1,23 +1,60 @@
 # server.py (Add the CORS configuration)
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware # <-- NEW IMPORT
-import uvicorn
 import logging
+import threading
 
 # Import configuration and endpoints
 from config import settings
-from api.endpoints import router as api_router
+from api.endpoints import router as api_router, event_batcher, reports_service
+from database.db_session import create_db_and_tables, start_read_snapshot_refresher, warm_up_pool
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def warm_up(app: FastAPI):
+    """
+    Pays the cold-start costs in the background: opens pooled DB connections, fills
+    the reporting snapshot (if configured) and runs each report once to warm
+    SQLAlchemy's compiled-query cache. /api/ready returns 503 until this finishes.
+    """
+    try:
+        warm_up_pool(settings.DB_POOL_WARMUP_CONNECTIONS)
+        start_read_snapshot_refresher(initial_refresh=True)
+        reports_service.get_monthly_revenue()
+        reports_service.get_aged_ar()
+    except Exception as e:
+        # Warm-up is an optimisation; /api/ready still checks the database itself
+        logger.error(f"Startup warm-up failed: {e}")
+    app.state.ready = True
+    logger.info(f"{settings.APP_NAME} is ready.")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Creates tables before serving, then warms up in the background (the worker
+    reports ready afterwards). Flushes queued procedure events on shutdown.
+    """
+    logger.info(f"{settings.APP_NAME} is starting up...")
+    app.state.ready = False
+    create_db_and_tables()
+    threading.Thread(target=warm_up, args=(app,), name="startup-warm-up", daemon=True).start()
+    yield
+    app.state.ready = False
+    event_batcher.stop()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.API_VERSION,
-    description="Intelligent Agent for Dental Billing & Financial Analysis."
+    description="Intelligent Agent for Dental Billing & Financial Analysis.",
+    lifespan=lifespan
 )
 
 # --- CORS CONFIGURATION (CRITICAL FIX) ---
@@ -42,14 +79,7 @@ app.add_middleware(
 app.include_router(api_router, prefix="/api")
 
 
-@app.on_event("startup")
-async def startup_event():
-    """
-    Event that runs when the application starts up.
-    """
-    logger.info(f"{settings.APP_NAME} is starting up...")
-
-
 # Standard way to run the application (e.g., 'python server.py')
 if __name__ == "__main__":
+    import uvicorn # Only needed here; the Procfile runs uvicorn itself
     uvicorn.run(app, host="0.0.0.0", port=8000)